@@ -0,0 +1,51 @@
+"""
+Reports timings of every available evaluation backend on random curve, surface and volume problems.
+Agreement with the numpy reference backend is checked by tests/test_backends.py.
+
+Usage: python benchmarks/backends.py [--points N]
+"""
+import argparse
+import time
+import numpy as np
+from freeformdeformation import backends
+
+def Problems(nPoints, rng):
+    # Returns a dictionary of kernel name -> argument tuple for random rational curve, surface and volume problems.
+    def Geometry(nControlPoints, degree):
+        interior = np.sort(rng.uniform(0, 1, nControlPoints - degree - 1))
+        knotVector = np.concatenate([np.zeros(degree + 1), interior, np.ones(degree + 1)])
+        return degree, knotVector, rng.uniform(0, 1, nPoints)
+    def ControlNet(shape):
+        weights = rng.uniform(0.5, 2.0, shape)
+        return np.concatenate([rng.normal(size=shape + (3,)) * weights[..., None], weights[..., None]], axis=-1)
+    (p1, k1, u1), (p2, k2, u2), (p3, k3, u3) = Geometry(12, 3), Geometry(9, 2), Geometry(7, 4)
+    return {
+        'CurvePoints': (ControlNet((12,)), p1, k1, u1),
+        'SurfacePoints': (ControlNet((12, 9)), p1, p2, k1, k2, u1, u2),
+        'VolumePoints': (ControlNet((12, 9, 7)), p1, p2, p3, k1, k2, k3, u1, u2, u3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=100000, help='number of points evaluated per kernel (default = 100000)')
+    args = parser.parse_args()
+    problems = Problems(args.points, np.random.default_rng(0))
+    for name in backends.BACKENDS:
+        try:
+            backend = backends.LoadBackend(name)
+        except ImportError as error:
+            print('{}: skipped ({})'.format(name, error))
+            continue
+        # the uncompiled loop backend is very slow, so keep it small
+        nPoints = min(args.points, 2000) if name == 'loop' else args.points
+        for kernel, arguments in problems.items():
+            nDirections = {'CurvePoints': 1, 'SurfacePoints': 2, 'VolumePoints': 3}[kernel]
+            arguments = arguments[:-nDirections] + tuple(u[:nPoints] for u in arguments[-nDirections:])
+            getattr(backend, kernel)(*arguments)  # warm up (compiles numba kernels)
+            start = time.perf_counter()
+            getattr(backend, kernel)(*arguments)
+            elapsed = time.perf_counter() - start
+            print('{}.{}: {:.1f} ms for {} points'.format(name, kernel, 1e3 * elapsed, nPoints))
+
+if __name__ == '__main__':
+    main()
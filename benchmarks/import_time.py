@@ -0,0 +1,48 @@
+"""
+Measures the cold import time of the freeformdeformation evaluation API and checks it against a budget.
+Each measurement runs in a fresh interpreter, like a short-lived pool worker, and the median is reported.
+Exits with a non-zero status if the budget is exceeded or if matplotlib is imported as a side effect.
+
+Usage: python benchmarks/import_time.py [--budget SECONDS] [--repeats N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import freeformdeformation
+freeformdeformation.NURBS.Curve
+elapsed = time.perf_counter() - start
+print(elapsed, 'matplotlib' in sys.modules)
+"""
+
+def ColdImportTime():
+    # Returns the import time in seconds, and whether matplotlib was loaded, measured in a fresh interpreter.
+    output = subprocess.run([sys.executable, '-c', SNIPPET], check=True, capture_output=True, text=True).stdout.split()
+    return float(output[0]), output[1] == 'True'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=0.25, help='maximum median import time in seconds (default = 0.25)')
+    parser.add_argument('--repeats', type=int, default=7, help='number of fresh interpreters to time (default = 7)')
+    args = parser.parse_args()
+    times, loadedMatplotlib = [], False
+    for _ in range(args.repeats):
+        elapsed, loaded = ColdImportTime()
+        times.append(elapsed)
+        loadedMatplotlib |= loaded
+    median = statistics.median(times)
+    print('cold import: median {:.1f} ms, min {:.1f} ms, budget {:.1f} ms'.format(1e3 * median, 1e3 * min(times), 1e3 * args.budget))
+    if loadedMatplotlib:
+        print('FAIL: matplotlib was imported by the evaluation API')
+        return 1
+    if median > args.budget:
+        print('FAIL: import time over budget')
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Free-form deformation with B-Spline and NURBS curves, surfaces and volumes.
+
+Only numpy is imported eagerly. Modules that are slow to import or that are
+optional (plotting, embedding, arc length, bounding volume and collection
+tools) are loaded on first attribute access, and numba is only imported when
+the 'numba' backend is selected, so short-lived worker processes only pay
+for what they use.
+"""
+from .geom_classes import BSpline, NURBS
+from .geom_functions import (KnotVector, FindSpan, FindSpans, WeightedControlPoints, BSplineBasisFuns,
+                             BSplineBasisFunsArray, BSplineBasisFunDerivsArray, CurveDerivativesArray,
+                             VolumeDirectionOrder, ExtractCoordinates, CurveCoordinates, KnotCoordinates)
+from .backends import SetBackend, GetBackend
+from . import geom_classes, geom_functions, backends
+
+__version__ = '0.1.0'
+
+# public name -> submodule that defines it, imported lazily by __getattr__
+_LAZY_ATTRIBUTES = {
+    'CurvePlot': 'visualisation',
+    'SurfacePlot': 'visualisation',
+    'Precision': 'embedding',
+    'PRECISIONS': 'embedding',
+    'GetPrecision': 'embedding',
+    'EmbeddedPoints': 'embedding',
+    'PrecisionReport': 'embedding',
+    'ArcLengthTable': 'arc_length',
+    'ElementSpans': 'bounding_volumes',
+    'ElementBounds': 'bounding_volumes',
+    'BoundingVolumeHierarchy': 'bounding_volumes',
+    'CurveCollection': 'geom_collections',
+    'SurfaceCollection': 'geom_collections',
+}
+_LAZY_MODULES = {'visualisation', 'embedding', 'arc_length', 'bounding_volumes', 'geom_collections'}
+
+__all__ = ['BSpline', 'NURBS', 'KnotVector', 'FindSpan', 'FindSpans', 'WeightedControlPoints',
+           'BSplineBasisFuns', 'BSplineBasisFunsArray', 'BSplineBasisFunDerivsArray', 'CurveDerivativesArray', 'VolumeDirectionOrder',
+           'ExtractCoordinates', 'CurveCoordinates', 'KnotCoordinates', 'SetBackend', 'GetBackend'] + list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    import importlib
+    if name in _LAZY_MODULES:
+        return importlib.import_module('.' + name, __name__)
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module('.' + _LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | _LAZY_MODULES | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,115 @@
+"""
+Evaluation kernels that loop over points one at a time, written in the subset of Python that numba can compile.
+
+This module is the plain Python 'loop' backend, and _numba_kernels.py executes the same source with jit
+set to numba.njit(cache=True) for the 'numba' backend. The kernels are module-level functions rather than
+closures so that numba can cache the compiled kernels on disk and reuse them in later processes.
+"""
+import numpy as np
+
+# _numba_kernels.py defines jit before executing this source when the kernels are to be compiled
+jit = globals().get('jit', lambda function: function)
+
+@jit
+def FindSpan(degree, parameter, knotVector):
+    # This is algorithm A2.1 on pg 68 of 'The NURBS Book' - Les Piegl & Wayne Tiller, 1997.
+    n = len(knotVector) - degree - 2
+    if parameter >= knotVector[n+1]:
+        return n
+    if parameter <= knotVector[degree]:
+        return degree
+    low = degree
+    high = n + 1
+    mid = (low + high) // 2
+    while parameter < knotVector[mid] or parameter >= knotVector[mid+1]:
+        if parameter < knotVector[mid]:
+            high = mid
+        else:
+            low = mid
+        mid = (low + high) // 2
+    return mid
+
+@jit
+def BasisFuns(span, parameter, degree, knotVector, B, left, right):
+    # This is algorithm A2.2 on pg 70 of 'The NURBS Book' - Les Piegl & Wayne Tiller, 1997, writing into B.
+    B[0] = 1.0
+    for j in range(1, degree + 1):
+        left[j] = parameter - knotVector[span+1-j]
+        right[j] = knotVector[span+j] - parameter
+        saved = 0.0
+        for r in range(j):
+            temp = B[r] / (right[r+1] + left[j-r])
+            B[r] = saved + right[r+1] * temp
+            saved = left[j-r] * temp
+        B[j] = saved
+
+@jit
+def CurvePoints(Pw, degree, knotVector, parameters):
+    d = Pw.shape[-1]
+    C = np.empty((parameters.shape[0], d - 1))
+    B = np.empty(degree + 1)
+    left = np.empty(degree + 1)
+    right = np.empty(degree + 1)
+    Cw = np.empty(d)
+    for n in range(parameters.shape[0]):
+        span = FindSpan(degree, parameters[n], knotVector)
+        BasisFuns(span, parameters[n], degree, knotVector, B, left, right)
+        Cw[:] = 0.0
+        for i in range(degree + 1):
+            for k in range(d):
+                Cw[k] += B[i] * Pw[span-degree+i, k]
+        for k in range(d - 1):
+            C[n, k] = Cw[k] / Cw[d-1]
+    return C
+
+@jit
+def SurfacePoints(Pw, degree1, degree2, knotVector1, knotVector2, parameters1, parameters2):
+    d = Pw.shape[-1]
+    S = np.empty((parameters1.shape[0], d - 1))
+    B1 = np.empty(degree1 + 1)
+    B2 = np.empty(degree2 + 1)
+    left = np.empty(max(degree1, degree2) + 1)
+    right = np.empty(max(degree1, degree2) + 1)
+    Sw = np.empty(d)
+    for n in range(parameters1.shape[0]):
+        span1 = FindSpan(degree1, parameters1[n], knotVector1)
+        span2 = FindSpan(degree2, parameters2[n], knotVector2)
+        BasisFuns(span1, parameters1[n], degree1, knotVector1, B1, left, right)
+        BasisFuns(span2, parameters2[n], degree2, knotVector2, B2, left, right)
+        Sw[:] = 0.0
+        for k in range(degree1 + 1):
+            for l in range(degree2 + 1):
+                b = B1[k] * B2[l]
+                for c in range(d):
+                    Sw[c] += b * Pw[span1-degree1+k, span2-degree2+l, c]
+        for c in range(d - 1):
+            S[n, c] = Sw[c] / Sw[d-1]
+    return S
+
+@jit
+def VolumePoints(Pw, degree1, degree2, degree3, knotVector1, knotVector2, knotVector3, parameters1, parameters2, parameters3):
+    d = Pw.shape[-1]
+    V = np.empty((parameters1.shape[0], d - 1))
+    B1 = np.empty(degree1 + 1)
+    B2 = np.empty(degree2 + 1)
+    B3 = np.empty(degree3 + 1)
+    left = np.empty(max(degree1, degree2, degree3) + 1)
+    right = np.empty(max(degree1, degree2, degree3) + 1)
+    Vw = np.empty(d)
+    for n in range(parameters1.shape[0]):
+        span1 = FindSpan(degree1, parameters1[n], knotVector1)
+        span2 = FindSpan(degree2, parameters2[n], knotVector2)
+        span3 = FindSpan(degree3, parameters3[n], knotVector3)
+        BasisFuns(span1, parameters1[n], degree1, knotVector1, B1, left, right)
+        BasisFuns(span2, parameters2[n], degree2, knotVector2, B2, left, right)
+        BasisFuns(span3, parameters3[n], degree3, knotVector3, B3, left, right)
+        Vw[:] = 0.0
+        for k in range(degree1 + 1):
+            for l in range(degree2 + 1):
+                for m in range(degree3 + 1):
+                    b = B1[k] * B2[l] * B3[m]
+                    for c in range(d):
+                        Vw[c] += b * Pw[span1-degree1+k, span2-degree2+l, span3-degree3+m, c]
+        for c in range(d - 1):
+            V[n, c] = Vw[c] / Vw[d-1]
+    return V
@@ -0,0 +1,16 @@
+"""
+The loop kernels of _loop_kernels.py compiled with numba. Importing this module imports numba.
+
+The kernel source is executed in this module's namespace with jit set to numba.njit(cache=True).
+Numba reloads cached kernels by importing the module that defined them, so the kernels must be
+defined in a real module (not a closure or a module built on the fly) for the disk cache to work.
+"""
+import os
+import numba
+
+def jit(function):
+    return numba.njit(cache=True)(function)
+
+_path = os.path.join(os.path.dirname(__file__), '_loop_kernels.py')
+with open(_path) as _file:
+    exec(compile(_file.read(), _path, 'exec'))
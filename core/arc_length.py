@@ -0,0 +1,90 @@
+from . import geom_functions as gf
+import numpy as np
+
+class ArcLengthTable:
+    """
+    Creates a table of cumulative arc lengths along a curve, computed once with Gauss-Legendre quadrature on each knot span.
+    The table supports total and partial length queries, and the inverse map from arc length to parametric coordinate.
+
+    Arguments & Keyword Arguments:
+    curve -- a curve object defined by a class from geom_classes.py
+    nGauss -- number of Gauss-Legendre points per sub-interval (default = 8)
+    subdivisions -- number of equal sub-intervals each non-empty knot span is split into (default = 4)
+    """
+    def __init__(self, curve, nGauss=8, subdivisions=4):
+        self.curve = curve
+        self.gaussPoints, self.gaussWeights = np.polynomial.legendre.leggauss(nGauss)
+        knots = np.unique(np.asarray(curve.knotVector, dtype=float)[curve.degree:len(curve.knotVector)-curve.degree])
+        fractions = np.linspace(0, 1, subdivisions + 1)[:-1]
+        self.breakpoints = np.append((knots[:-1, None] + np.diff(knots)[:, None] * fractions).ravel(), knots[-1])
+        segmentLengths = self._Integrate(self.breakpoints[:-1], self.breakpoints[1:])
+        self.lengths = np.concatenate([[0.0], np.cumsum(segmentLengths)])
+
+    def _Speed(self, parameters):
+        # Returns the magnitude of the curve's first derivative at an array of parameters.
+        return np.linalg.norm(gf.CurveDerivativesArray(self.curve, parameters)[1], axis=-1)
+
+    def _Integrate(self, a, b):
+        # Returns the arc length between each pair of parameters in arrays a and b using Gauss-Legendre quadrature.
+        halfWidth = (b - a) / 2
+        nodes = (a + b)[:, None] / 2 + halfWidth[:, None] * self.gaussPoints
+        return halfWidth * (self._Speed(nodes) @ self.gaussWeights)
+
+    def TotalLength(self):
+        # Returns the total arc length of the curve.
+        return self.lengths[-1]
+
+    def Length(self, start=None, stop=None):
+        """
+        Returns the arc length between two parametric coordinates, which may be arrays of the same shape.
+
+        Keyword arguments:
+        start -- parametric coordinate at which length is measured from (default = start of curve)
+        stop -- parametric coordinate at which length is measured to (default = end of curve)
+        """
+        start = self.breakpoints[0] if start is None else start
+        stop = self.breakpoints[-1] if stop is None else stop
+        return self._CumulativeLength(stop) - self._CumulativeLength(start)
+
+    def _CumulativeLength(self, parameters):
+        # Returns the arc length from the start of the curve to each parameter in an array of parameters.
+        parameters = np.asarray(parameters, dtype=float)
+        flat = parameters.ravel()
+        if np.any(flat < self.breakpoints[0]) or np.any(flat > self.breakpoints[-1]):
+            raise IndexError("parameters out of range: [{}, {}]".format(self.breakpoints[0], self.breakpoints[-1]))
+        segments = np.clip(np.searchsorted(self.breakpoints, flat, side='right') - 1, 0, len(self.breakpoints) - 2)
+        lengths = self.lengths[segments] + self._Integrate(self.breakpoints[segments], flat)
+        return lengths.reshape(parameters.shape)
+
+    def Parameters(self, arcLengths, tolerance=1e-12, maxIterations=20):
+        """
+        Returns the parametric coordinates at which the arc length from the start of the curve equals each value in an array.
+        A safeguarded Newton iteration is started from linear interpolation of the table, falling back to bisection within each sub-interval.
+
+        Arguments & Keyword Arguments:
+        arcLengths -- array of arc lengths measured from the start of the curve
+        tolerance -- tolerance on arc length error relative to total length (default = 1e-12)
+        maxIterations -- maximum number of Newton iterations (default = 20)
+        """
+        arcLengths = np.asarray(arcLengths, dtype=float)
+        s = np.clip(arcLengths.ravel(), 0.0, self.TotalLength())
+        segments = np.clip(np.searchsorted(self.lengths, s, side='right') - 1, 0, len(self.breakpoints) - 2)
+        segmentStarts = self.breakpoints[segments]
+        low, high = segmentStarts.copy(), self.breakpoints[segments + 1]
+        u = np.interp(s, self.lengths, self.breakpoints)
+        active = np.ones(len(s), dtype=bool)
+        for _ in range(maxIterations):
+            if not np.any(active):
+                break
+            error = self.lengths[segments[active]] + self._Integrate(segmentStarts[active], u[active]) - s[active]
+            speed = self._Speed(u[active])
+            converged = np.abs(error) <= tolerance * max(self.TotalLength(), 1.0)
+            # tighten the bracket, then take a Newton step or bisect if the step leaves the bracket
+            lo, hi = np.where(error < 0, u[active], low[active]), np.where(error > 0, u[active], high[active])
+            step = u[active] - np.divide(error, speed, out=np.full_like(error, np.inf), where=speed > 0)
+            step = np.where((step > lo) & (step < hi), step, (lo + hi) / 2)
+            index = np.flatnonzero(active)
+            u[index] = np.where(converged, u[index], step)
+            low[index], high[index] = np.where(converged, low[index], lo), np.where(converged, high[index], hi)
+            active[index[converged]] = False
+        return u.reshape(arcLengths.shape)
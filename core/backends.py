@@ -0,0 +1,133 @@
+"""
+Selects the kernels used to evaluate many points on curves, surfaces and volumes at once.
+
+The 'numpy' backend is the reference and the default. The 'numba' backend compiles
+loops that fuse the span search, basis function recursion and control net contraction
+for each point, which avoids the temporary arrays of the numpy backend. Numba is only
+imported when that backend is first selected, and selecting it without numba installed
+falls back to the numpy backend with a warning.
+
+All kernels take homogeneous (weighted) control points with one axis per parametric
+direction in direction order, followed by the coordinate axis (see gf.WeightedControlPoints).
+"""
+import warnings
+import numpy as np
+from . import geom_functions as gf
+
+class Backend:
+    """
+    Creates a set of evaluation kernels.
+
+    Arguments:
+    name -- name of the backend
+    CurvePoints -- function(Pw, degree, knotVector, parameters) returning array of curve coordinates
+    SurfacePoints -- function(Pw, degree1, degree2, knotVector1, knotVector2, parameters1, parameters2) returning array of surface coordinates
+    VolumePoints -- function(Pw, degree1, degree2, degree3, knotVector1, knotVector2, knotVector3, parameters1, parameters2, parameters3) returning array of volume coordinates
+    """
+    def __init__(self, name, CurvePoints, SurfacePoints, VolumePoints):
+        self.name = name
+        self.CurvePoints = CurvePoints
+        self.SurfacePoints = SurfacePoints
+        self.VolumePoints = VolumePoints
+
+def _NumpyCurvePoints(Pw, degree, knotVector, parameters):
+    spans = gf.FindSpans(degree, parameters, knotVector)
+    B = gf.BSplineBasisFunsArray(spans, parameters, degree, knotVector)
+    Cw = np.einsum('ni,nid->nd', B, Pw[spans[:, None] - degree + np.arange(degree + 1)])
+    return Cw[:, :-1] / Cw[:, -1:]
+
+def _NumpySurfacePoints(Pw, degree1, degree2, knotVector1, knotVector2, parameters1, parameters2):
+    spans1 = gf.FindSpans(degree1, parameters1, knotVector1)
+    spans2 = gf.FindSpans(degree2, parameters2, knotVector2)
+    B1 = gf.BSplineBasisFunsArray(spans1, parameters1, degree1, knotVector1)
+    B2 = gf.BSplineBasisFunsArray(spans2, parameters2, degree2, knotVector2)
+    i1 = spans1[:, None] - degree1 + np.arange(degree1 + 1)
+    i2 = spans2[:, None] - degree2 + np.arange(degree2 + 1)
+    Sw = np.einsum('nk,nl,nkld->nd', B1, B2, Pw[i1[:, :, None], i2[:, None, :]])
+    return Sw[:, :-1] / Sw[:, -1:]
+
+def _NumpyVolumePoints(Pw, degree1, degree2, degree3, knotVector1, knotVector2, knotVector3, parameters1, parameters2, parameters3):
+    spans1 = gf.FindSpans(degree1, parameters1, knotVector1)
+    spans2 = gf.FindSpans(degree2, parameters2, knotVector2)
+    spans3 = gf.FindSpans(degree3, parameters3, knotVector3)
+    B1 = gf.BSplineBasisFunsArray(spans1, parameters1, degree1, knotVector1)
+    B2 = gf.BSplineBasisFunsArray(spans2, parameters2, degree2, knotVector2)
+    B3 = gf.BSplineBasisFunsArray(spans3, parameters3, degree3, knotVector3)
+    i1 = spans1[:, None] - degree1 + np.arange(degree1 + 1)
+    i2 = spans2[:, None] - degree2 + np.arange(degree2 + 1)
+    i3 = spans3[:, None] - degree3 + np.arange(degree3 + 1)
+    P = Pw[i1[:, :, None, None], i2[:, None, :, None], i3[:, None, None, :]]
+    Vw = np.einsum('nk,nl,nm,nklmd->nd', B1, B2, B3, P)
+    return Vw[:, :-1] / Vw[:, -1:]
+
+def _Validated(kernels, name):
+    # Returns a Backend that converts arguments to contiguous float arrays and checks parameter ranges before calling compiled kernels.
+    def Prepare(Pw, degrees, knotVectors, parameters):
+        Pw = np.ascontiguousarray(Pw, dtype=np.float64)
+        knotVectors = [np.ascontiguousarray(knotVector, dtype=np.float64) for knotVector in knotVectors]
+        parameters = [np.ascontiguousarray(p, dtype=np.float64).ravel() for p in parameters]
+        # the span search in the loop kernels only terminates for parameters in [knotVector[degree], knotVector[-degree-1]]
+        for degree, knotVector, p in zip(degrees, knotVectors, parameters):
+            if np.any(p < knotVector[degree]) or np.any(p > knotVector[-degree-1]):
+                raise IndexError("parameters out of range: [{}, {}]".format(knotVector[degree], knotVector[-degree-1]))
+        return [Pw] + [int(degree) for degree in degrees] + knotVectors + parameters
+    def CurvePoints(Pw, degree, knotVector, parameters):
+        return kernels.CurvePoints(*Prepare(Pw, [degree], [knotVector], [parameters]))
+    def SurfacePoints(Pw, degree1, degree2, knotVector1, knotVector2, parameters1, parameters2):
+        return kernels.SurfacePoints(*Prepare(Pw, [degree1, degree2], [knotVector1, knotVector2], [parameters1, parameters2]))
+    def VolumePoints(Pw, degree1, degree2, degree3, knotVector1, knotVector2, knotVector3, parameters1, parameters2, parameters3):
+        return kernels.VolumePoints(*Prepare(Pw, [degree1, degree2, degree3], [knotVector1, knotVector2, knotVector3], [parameters1, parameters2, parameters3]))
+    return Backend(name, CurvePoints, SurfacePoints, VolumePoints)
+
+def _NumbaBackend():
+    # Returns the numba backend, compiling kernels lazily on first call. Raises ImportError if numba is not installed.
+    # Compiled kernels are cached on disk, so only the first process to use them pays the compile time.
+    from . import _numba_kernels
+    return _Validated(_numba_kernels, 'numba')
+
+def _LoopBackend():
+    # Returns the uncompiled loop kernels, which are slow but let the numba kernels be checked without numba installed.
+    from . import _loop_kernels
+    return _Validated(_loop_kernels, 'loop')
+
+BACKENDS = {'numpy': lambda: Backend('numpy', _NumpyCurvePoints, _NumpySurfacePoints, _NumpyVolumePoints),
+            'numba': _NumbaBackend,
+            'loop': _LoopBackend}
+_loaded = {}
+_active = 'numpy'
+
+def LoadBackend(name):
+    """
+    Returns the Backend with a given name, building it on first use.
+    Raises ImportError if the backend's optional dependency is not installed.
+    """
+    if name not in BACKENDS:
+        raise ValueError("backend == {} not one of {}".format(name, list(BACKENDS)))
+    if name not in _loaded:
+        _loaded[name] = BACKENDS[name]()
+    return _loaded[name]
+
+def SetBackend(name, fallback=True):
+    """
+    Selects the backend used for evaluation, and returns the name of the backend actually selected.
+    The first call of each 'numba' kernel compiles it (around a second) unless numba's on-disk cache already holds it,
+    so later calls and later processes on the same machine are fast.
+
+    Arguments & Keyword Arguments:
+    name -- one of 'numpy' (default reference), 'numba' (compiled) or 'loop' (uncompiled numba kernels, for checking)
+    fallback -- if True, fall back to 'numpy' with a warning when the backend's dependency is missing, otherwise raise ImportError (default = True)
+    """
+    global _active
+    try:
+        LoadBackend(name)
+    except ImportError as error:
+        if not fallback:
+            raise
+        warnings.warn("backend '{}' unavailable ({}), falling back to 'numpy'".format(name, error))
+        name = 'numpy'
+    _active = name
+    return name
+
+def GetBackend():
+    # Returns the currently selected Backend.
+    return LoadBackend(_active)
@@ -0,0 +1,232 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from . import geom_functions as gf
+
+def _ControlNet(geometricObject):
+    # Returns control points as an array with one axis per parametric direction, in direction order, with the degrees and knot vectors of those directions.
+    controlPoints = np.asarray(geometricObject.controlPoints, dtype=float)
+    if geometricObject.dimension == 1:
+        return controlPoints, [geometricObject.degree], [geometricObject.knotVector]
+    elif geometricObject.dimension == 2:
+        degrees = [geometricObject.degree1, geometricObject.degree2]
+        knotVectors = [geometricObject.knotVector1, geometricObject.knotVector2]
+        return controlPoints, degrees, knotVectors
+    elif geometricObject.dimension == 3:
+        degrees = [geometricObject.degree1, geometricObject.degree2, geometricObject.degree3]
+        knotVectors = [geometricObject.knotVector1, geometricObject.knotVector2, geometricObject.knotVector3]
+        return gf.VolumeDirectionOrder(controlPoints), degrees, knotVectors
+    else:
+        raise ValueError("Geometric object has invalid dimension.")
+
+def ElementSpans(geometricObject):
+    """
+    Returns an array of knot span indices with one row for each Bezier element (non-empty knot span) of a geometric object.
+
+    Arguments:
+    geometricObject -- a curve, surface or volume object defined by a class from geom_classes.py
+    """
+    _, degrees, knotVectors = _ControlNet(geometricObject)
+    spans = []
+    for degree, knotVector in zip(degrees, knotVectors):
+        knotVector = np.asarray(knotVector, dtype=float)
+        candidates = np.arange(degree, len(knotVector) - degree - 1)
+        spans.append(candidates[knotVector[candidates] < knotVector[candidates + 1]])
+    grids = np.meshgrid(*spans, indexing='ij')
+    return np.column_stack([grid.ravel() for grid in grids])
+
+def ElementBounds(geometricObject, spans=None):
+    """
+    Returns the lower and upper corners of an axis-aligned bounding box around each Bezier element of a geometric object.
+    Each box bounds the element's control points, so by the convex hull property (for positive weights) it also bounds the element.
+
+    Arguments & Keyword Arguments:
+    geometricObject -- a curve, surface or volume object defined by a class from geom_classes.py
+    spans -- array of element knot span indices (default = ElementSpans(geometricObject))
+    """
+    controlPoints, degrees, _ = _ControlNet(geometricObject)
+    spans = ElementSpans(geometricObject) if spans is None else spans
+    window = tuple(degree + 1 for degree in degrees)
+    axes = tuple(range(len(degrees)))
+    # windows are indexed by the first control point of each element, i.e. span - degree
+    windows = sliding_window_view(controlPoints, window, axis=axes)
+    lower = windows.min(axis=tuple(range(-len(degrees), 0)))
+    upper = windows.max(axis=tuple(range(-len(degrees), 0)))
+    first = tuple(spans[:, k] - degrees[k] for k in range(len(degrees)))
+    return lower[first], upper[first]
+
+def _BoxDistance(points, lower, upper):
+    # Returns the distance from each point to the corresponding axis-aligned box (zero inside the box).
+    return np.linalg.norm(np.maximum(np.maximum(lower - points, points - upper), 0.0), axis=-1)
+
+def _RaggedArange(counts):
+    # Returns concatenated aranges of the given lengths, e.g. [2, 3] -> [0, 1, 0, 1, 2].
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+class BoundingVolumeHierarchy:
+    """
+    Creates an axis-aligned bounding box hierarchy over the Bezier elements of a curve, surface or volume.
+    Queries are vectorised over batches of points or rays, and the hierarchy can be refitted cheaply after control points move.
+
+    Arguments & Keyword Arguments:
+    geometricObject -- a curve, surface or volume object defined by a class from geom_classes.py
+    leafSize -- maximum number of elements in each leaf node (default = 4)
+    """
+    def __init__(self, geometricObject, leafSize=4):
+        self.geometricObject = geometricObject
+        self.leafSize = leafSize
+        self.spans = ElementSpans(geometricObject)
+        self.elementLower, self.elementUpper = ElementBounds(geometricObject, self.spans)
+        self.order = np.arange(len(self.spans))
+        left, right, start, count = [], [], [], []
+        centroids = (self.elementLower + self.elementUpper) / 2
+        # nodes are stored in pre-order, so children always come after their parent
+        stack = [(0, len(self.order), None, None)]
+        while stack:
+            begin, end, parent, side = stack.pop()
+            node = len(left)
+            left.append(-1)
+            right.append(-1)
+            start.append(begin)
+            count.append(end - begin)
+            if parent is not None:
+                (left if side == 0 else right)[parent] = node
+            if end - begin > leafSize:
+                elements = self.order[begin:end]
+                extent = np.ptp(centroids[elements], axis=0)
+                axis = np.argmax(extent)
+                self.order[begin:end] = elements[np.argsort(centroids[elements, axis], kind='stable')]
+                middle = (begin + end) // 2
+                stack.append((middle, end, node, 1))
+                stack.append((begin, middle, node, 0))
+        self.left, self.right = np.array(left), np.array(right)
+        self.start, self.count = np.array(start), np.array(count)
+        self.nodeLower = np.zeros((len(left), self.elementLower.shape[-1]))
+        self.nodeUpper = np.zeros_like(self.nodeLower)
+        self._RefitNodes()
+
+    def _RefitNodes(self):
+        # Recomputes node boxes bottom-up from the element boxes.
+        for node in reversed(range(len(self.left))):
+            if self.left[node] < 0:
+                elements = self.order[self.start[node]:self.start[node] + self.count[node]]
+                self.nodeLower[node] = self.elementLower[elements].min(axis=0)
+                self.nodeUpper[node] = self.elementUpper[elements].max(axis=0)
+            else:
+                children = [self.left[node], self.right[node]]
+                self.nodeLower[node] = self.nodeLower[children].min(axis=0)
+                self.nodeUpper[node] = self.nodeUpper[children].max(axis=0)
+
+    def Refit(self):
+        """
+        Updates all bounding boxes from the geometric object's current control points, keeping the tree structure.
+        The knot vectors and degrees must be unchanged since the hierarchy was built.
+        """
+        self.elementLower, self.elementUpper = ElementBounds(self.geometricObject, self.spans)
+        self._RefitNodes()
+
+    def _Traverse(self, nQueries, Overlaps):
+        # Returns (query, element) index pairs for which Overlaps(queries, lower, upper) is true for every box on the path to the element.
+        queries, nodes = np.arange(nQueries), np.zeros(nQueries, dtype=int)
+        # seed with empty arrays so an empty batch (or no hits) concatenates cleanly
+        hitQueries, hitElements = [np.zeros(0, dtype=int)], [np.zeros(0, dtype=int)]
+        while len(queries):
+            keep = Overlaps(queries, self.nodeLower[nodes], self.nodeUpper[nodes])
+            queries, nodes = queries[keep], nodes[keep]
+            leaf = self.left[nodes] < 0
+            counts = self.count[nodes[leaf]]
+            leafQueries = np.repeat(queries[leaf], counts)
+            elements = self.order[np.repeat(self.start[nodes[leaf]], counts) + _RaggedArange(counts)]
+            keep = Overlaps(leafQueries, self.elementLower[elements], self.elementUpper[elements])
+            hitQueries.append(leafQueries[keep])
+            hitElements.append(elements[keep])
+            queries = np.repeat(queries[~leaf], 2)
+            nodes = np.column_stack([self.left[nodes[~leaf]], self.right[nodes[~leaf]]]).ravel()
+        hitQueries, hitElements = np.concatenate(hitQueries), np.concatenate(hitElements)
+        sort = np.lexsort((hitElements, hitQueries))
+        return hitQueries[sort], hitElements[sort]
+
+    def CandidateElements(self, points, tolerance=0.0):
+        """
+        Returns arrays of (point index, element index) pairs for every element whose bounding box contains a point.
+        Element indices refer to rows of self.spans.
+
+        Arguments & Keyword Arguments:
+        points -- array of Cartesian coordinates with shape (number of points, number of coordinates)
+        tolerance -- distance by which each bounding box is enlarged (default = 0.0)
+        """
+        points = np.asarray(points, dtype=float)
+        def Overlaps(queries, lower, upper):
+            return np.all((points[queries] >= lower - tolerance) & (points[queries] <= upper + tolerance), axis=-1)
+        return self._Traverse(len(points), Overlaps)
+
+    def PointsInBounds(self, points, tolerance=0.0):
+        """
+        Returns a boolean array that is true for each point lying inside at least one element bounding box.
+        Points outside every box are guaranteed to lie outside the geometric object, so this is a conservative containment test.
+
+        Arguments & Keyword Arguments:
+        points -- array of Cartesian coordinates with shape (number of points, number of coordinates)
+        tolerance -- distance by which each bounding box is enlarged (default = 0.0)
+        """
+        inside = np.zeros(len(points), dtype=bool)
+        inside[self.CandidateElements(points, tolerance)[0]] = True
+        return inside
+
+    def NearestElements(self, points):
+        """
+        Returns the index of the element whose bounding box is nearest to each point, and the distance to that box.
+        The distance is a lower bound on the distance from the point to the element itself.
+
+        Arguments:
+        points -- array of Cartesian coordinates with shape (number of points, number of coordinates)
+        """
+        points = np.asarray(points, dtype=float)
+        best = np.full(len(points), np.inf)
+        bestElements = np.full(len(points), -1)
+        queries, nodes = np.arange(len(points)), np.zeros(len(points), dtype=int)
+        while len(queries):
+            distances = _BoxDistance(points[queries], self.nodeLower[nodes], self.nodeUpper[nodes])
+            keep = distances <= best[queries]
+            queries, nodes = queries[keep], nodes[keep]
+            leaf = self.left[nodes] < 0
+            counts = self.count[nodes[leaf]]
+            leafQueries = np.repeat(queries[leaf], counts)
+            elements = self.order[np.repeat(self.start[nodes[leaf]], counts) + _RaggedArange(counts)]
+            distances = _BoxDistance(points[leafQueries], self.elementLower[elements], self.elementUpper[elements])
+            # keep the closest element for each query, then merge with the best found so far
+            sort = np.lexsort((elements, distances, leafQueries))
+            leafQueries, elements, distances = leafQueries[sort], elements[sort], distances[sort]
+            first = np.ones(len(leafQueries), dtype=bool)
+            first[1:] = leafQueries[1:] != leafQueries[:-1]
+            leafQueries, elements, distances = leafQueries[first], elements[first], distances[first]
+            better = distances < best[leafQueries]
+            best[leafQueries[better]] = distances[better]
+            bestElements[leafQueries[better]] = elements[better]
+            queries = np.repeat(queries[~leaf], 2)
+            nodes = np.column_stack([self.left[nodes[~leaf]], self.right[nodes[~leaf]]]).ravel()
+        return bestElements, best
+
+    def RayCandidates(self, origins, directions):
+        """
+        Returns arrays of (ray index, element index) pairs for every element whose bounding box is hit by a ray.
+        Rays start at their origin and extend in the positive direction only.
+
+        Arguments:
+        origins -- array of ray origin coordinates with shape (number of rays, number of coordinates)
+        directions -- array of ray direction vectors with the same shape as origins
+        """
+        origins = np.asarray(origins, dtype=float)
+        directions = np.asarray(directions, dtype=float)
+        # a ray parallel to an axis only hits a box if its origin lies within that slab (faces included),
+        # and is then unbounded in that axis
+        parallel = directions == 0
+        inverse = 1.0 / np.where(parallel, 1.0, directions)
+        def Overlaps(queries, lower, upper):
+            o, inv, par = origins[queries], inverse[queries], parallel[queries]
+            t1 = (lower - o) * inv
+            t2 = (upper - o) * inv
+            tNear = np.where(par, -np.inf, np.minimum(t1, t2)).max(axis=-1)
+            tFar = np.where(par, np.inf, np.maximum(t1, t2)).min(axis=-1)
+            inSlabs = np.all(~par | ((lower <= o) & (o <= upper)), axis=-1)
+            return inSlabs & (tFar >= np.maximum(tNear, 0.0))
+        return self._Traverse(len(origins), Overlaps)
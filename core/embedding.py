@@ -0,0 +1,133 @@
+from . import geom_functions as gf
+import numpy as np
+
+class Precision:
+    """
+    Creates a precision policy for evaluation outputs and cached embedding tables.
+
+    Keyword arguments:
+    coordinateDtype -- dtype used to store parametric coordinates and evaluated points (default = float64)
+    weightDtype -- dtype used to store basis function weights (default = float64)
+    spanDtype -- dtype used to store knot span indices, or 'compact' to use the smallest unsigned integer that fits (default = int64)
+    accumulateDtype -- dtype used when summing basis weights against control points (default = float64)
+    """
+    def __init__(self, coordinateDtype=np.float64, weightDtype=np.float64, spanDtype=np.int64, accumulateDtype=np.float64):
+        self.coordinateDtype = np.dtype(coordinateDtype)
+        self.weightDtype = np.dtype(weightDtype)
+        self.spanDtype = spanDtype if spanDtype == 'compact' else np.dtype(spanDtype)
+        self.accumulateDtype = np.dtype(accumulateDtype)
+
+    def SpanDtype(self, knotVector):
+        # Returns the dtype used to store span indices into a given knot vector.
+        if self.spanDtype == 'compact':
+            return np.min_scalar_type(len(knotVector) - 1)
+        return self.spanDtype
+
+# 'double' is the reference path, 'single' stores and accumulates in float32,
+# 'mixed' stores in float32 but accumulates in float64
+PRECISIONS = {
+    'double': Precision(),
+    'single': Precision(np.float32, np.float32, 'compact', np.float32),
+    'mixed': Precision(np.float32, np.float32, 'compact', np.float64),
+}
+
+def GetPrecision(precision):
+    """
+    Returns a Precision object given either a Precision object or the name of one in PRECISIONS.
+    """
+    if isinstance(precision, Precision):
+        return precision
+    if precision not in PRECISIONS:
+        raise ValueError("precision == {} not one of {}".format(precision, list(PRECISIONS)))
+    return PRECISIONS[precision]
+
+class EmbeddedPoints:
+    """
+    Creates a cached table of knot spans and basis function weights for points embedded in a NURBS volume.
+    Once the table is built, the points can be re-evaluated cheaply every time the volume's control points move,
+    which is the inner loop of free-form deformation.
+
+    Arguments & Keyword Arguments:
+    volume -- a volume object defined by NURBS.Volume in geom_classes.py
+    parameters -- array of parametric coordinates with shape (number of points, 3)
+    precision -- a Precision object or one of 'double', 'single' or 'mixed' (default = 'double')
+    blockSize -- number of points processed at once while building the table, which bounds the size of temporary arrays (default = 65536)
+    """
+    def __init__(self, volume, parameters, precision='double', blockSize=65536):
+        self.volume = volume
+        self.precision = GetPrecision(precision)
+        parameters = np.asarray(parameters)
+        self.parameters = parameters.astype(self.precision.coordinateDtype)
+        degrees = (volume.degree1, volume.degree2, volume.degree3)
+        knotVectors = (volume.knotVector1, volume.knotVector2, volume.knotVector3)
+        # tables are filled in blocks so that float64 temporaries never exceed blockSize rows
+        self.spans = [np.zeros(len(parameters), dtype=self.precision.SpanDtype(knotVector)) for knotVector in knotVectors]
+        self.basis = [np.zeros((len(parameters), degree + 1), dtype=self.precision.weightDtype) for degree in degrees]
+        for start in range(0, len(parameters), blockSize):
+            block = slice(start, start + blockSize)
+            for direction in range(3):
+                blockParameters = parameters[block, direction].astype(np.float64)
+                spans = gf.FindSpans(degrees[direction], blockParameters, knotVectors[direction])
+                self.spans[direction][block] = spans
+                self.basis[direction][block] = gf.BSplineBasisFunsArray(spans, blockParameters, degrees[direction], knotVectors[direction])
+
+    def __len__(self):
+        return len(self.parameters)
+
+    def nbytes(self):
+        # Returns the number of bytes used by the cached parametric coordinates, spans and basis weights.
+        return self.parameters.nbytes + sum(s.nbytes for s in self.spans) + sum(B.nbytes for B in self.basis)
+
+    def PointCoordinates(self, blockSize=65536):
+        """
+        Returns an array of Cartesian coordinates of the embedded points, using the volume's current control points and weights.
+        This is a vectorised version of NURBS.Volume.PointCoordinates that reuses the cached spans and basis weights.
+
+        Keyword arguments:
+        blockSize -- number of points evaluated at once, which bounds the size of the (blockSize, 4) temporary arrays (default = 65536)
+        """
+        volume = self.volume
+        accumulateDtype = self.precision.accumulateDtype
+        Pw = gf.VolumeDirectionOrder(gf.WeightedControlPoints(volume.controlPoints, volume.weights, dimension=3)).astype(accumulateDtype)
+        k1 = np.arange(volume.degree1 + 1)
+        k2 = np.arange(volume.degree2 + 1)
+        k3 = np.arange(volume.degree3 + 1)
+        V = np.zeros((len(self), Pw.shape[-1] - 1), dtype=self.precision.coordinateDtype)
+        for start in range(0, len(self), blockSize):
+            block = slice(start, start + blockSize)
+            i1 = self.spans[0][block].astype(np.intp)[:, None] - volume.degree1 + k1
+            i2 = self.spans[1][block].astype(np.intp)[:, None] - volume.degree2 + k2
+            i3 = self.spans[2][block].astype(np.intp)[:, None] - volume.degree3 + k3
+            B1, B2, B3 = (B[block].astype(accumulateDtype) for B in self.basis)
+            # accumulate one local control point at a time, so temporaries are (block, 4) rather than (block, p1+1, p2+1, p3+1, 4)
+            Vw = np.zeros((len(B1), Pw.shape[-1]), dtype=accumulateDtype)
+            for k in k1:
+                for l in k2:
+                    B12 = B1[:, k] * B2[:, l]
+                    for m in k3:
+                        Vw += (B12 * B3[:, m])[:, None] * Pw[i1[:, k], i2[:, l], i3[:, m]]
+            V[block] = Vw[:, :-1] / Vw[:, -1:]
+        return V
+
+def PrecisionReport(volume, parameters, precision, blockSize=65536):
+    """
+    Returns a dictionary comparing the accuracy and memory use of a precision policy against the float64 reference path.
+
+    Arguments & Keyword Arguments:
+    volume -- a volume object defined by NURBS.Volume in geom_classes.py
+    parameters -- array of parametric coordinates with shape (number of points, 3)
+    precision -- a Precision object or one of 'double', 'single' or 'mixed'
+    blockSize -- number of points evaluated at once (default = 65536)
+    """
+    reference = EmbeddedPoints(volume, parameters, precision='double', blockSize=blockSize)
+    candidate = EmbeddedPoints(volume, parameters, precision=precision, blockSize=blockSize)
+    referenceCoords = reference.PointCoordinates(blockSize=blockSize)
+    candidateCoords = candidate.PointCoordinates(blockSize=blockSize).astype(np.float64)
+    errors = np.linalg.norm(candidateCoords - referenceCoords, axis=1)
+    return {
+        'maxError': float(errors.max()) if len(errors) else 0.0,
+        'rmsError': float(np.sqrt(np.mean(errors**2))) if len(errors) else 0.0,
+        'referenceBytes': reference.nbytes(),
+        'bytes': candidate.nbytes(),
+        'memoryRatio': candidate.nbytes() / reference.nbytes() if reference.nbytes() else 1.0,
+    }
@@ -1,4 +1,5 @@
-import geom_functions as gf
+from . import geom_functions as gf
+from . import backends
 import numpy as np
 
 class BSpline:
@@ -144,17 +145,9 @@ class NURBS:
             parameter2values = np.linspace(start2, stop2, N2)
         
             parameter1mesh, parameter2mesh = np.meshgrid(parameter1values, parameter2values)
-            S = np.nan * np.ones((len(parameter1mesh), len(parameter1mesh[0])), dtype=np.ndarray)
-            for i in range(len(parameter1mesh)):
-                for j in range(len(parameter1mesh[0])):
-                    S[i][j] = self.PointCoordinates(parameter1mesh[i][j], parameter2mesh[i][j])
-            
-            surfacePointXs, surfacePointYs, surfacePointZs = np.zeros((N2, N1)), np.zeros((N2, N1)), np.zeros((N2, N1))
-            for i in range(len(S)):
-                for j in range(len(S[0])):
-                    surfacePointXs[i][j] = S[i][j][0]
-                    surfacePointYs[i][j] = S[i][j][1]
-                    surfacePointZs[i][j] = S[i][j][2]
+            Pw = gf.WeightedControlPoints(self.controlPoints, self.weights, self.dimension)
+            S = backends.GetBackend().SurfacePoints(Pw, self.degree1, self.degree2, self.knotVector1, self.knotVector2, parameter1mesh.ravel(), parameter2mesh.ravel())
+            surfacePointXs, surfacePointYs, surfacePointZs = (S[:, k].reshape(N2, N1) for k in range(3))
             return surfacePointXs, surfacePointYs, surfacePointZs
         
     class Volume:
@@ -204,4 +197,15 @@ class NURBS:
             for k in range(len(V)):
                 V[k] = Vw[k] / Vw[-1]
             return V
-    
+
+        def PointCoordinatesArray(self, parameters1, parameters2, parameters3):
+            """
+            Returns an array of Cartesian coordinates at arrays of parametric points in a NURBS volume.
+            Points are evaluated together with the kernels of the selected backend (see backends.py).
+
+            Arguments:
+            parameters1, parameters2, parameters3 -- arrays of parametric coordinates in directions 1, 2 and 3 respectively
+            """
+            Pw = gf.VolumeDirectionOrder(gf.WeightedControlPoints(self.controlPoints, self.weights, self.dimension))
+            return backends.GetBackend().VolumePoints(Pw, self.degree1, self.degree2, self.degree3, self.knotVector1, self.knotVector2, self.knotVector3,
+                                                      np.ravel(parameters1), np.ravel(parameters2), np.ravel(parameters3))
@@ -0,0 +1,187 @@
+import numpy as np
+from . import geom_functions as gf
+
+def _PaddedKnots(knotVectors):
+    # Returns knot vectors as rows of a 2D array, padded with +inf so padding never counts as a knot at or below a parameter.
+    knots = np.full((len(knotVectors), max(len(knotVector) for knotVector in knotVectors)), np.inf)
+    for g, knotVector in enumerate(knotVectors):
+        knots[g, :len(knotVector)] = knotVector
+    return knots
+
+def _Spans(degree, knots, lengths, members, parameters):
+    # Returns knot span indices for parameters on given rows (members) of padded knots, like gf.FindSpans for each row.
+    rowKnots = knots[members]
+    first, last = rowKnots[:, degree], rowKnots[np.arange(len(members)), lengths[members] - degree - 1]
+    if np.any(parameters < first) or np.any(parameters > last):
+        raise IndexError("parameters out of range of their member's knot vector")
+    spans = (rowKnots <= parameters[:, None]).sum(axis=1) - 1
+    return np.clip(spans, degree, lengths[members] - degree - 2)
+
+def _Basis(degree, knots, spans, members, parameters):
+    # Returns basis functions for parameters on given rows of padded knots, by indexing the flattened knot array.
+    return gf.BSplineBasisFunsArray(members * knots.shape[1] + spans, parameters, degree, knots.ravel())
+
+def _Offsets(counts):
+    # Returns offsets such that member i's results are rows offsets[i]:offsets[i+1].
+    return np.concatenate([[0], np.cumsum(counts)]).astype(np.intp)
+
+class _CurveGroup:
+    # Padded storage for all curves in a collection that share a degree.
+    def __init__(self, curves, members):
+        self.members = np.asarray(members)
+        self.degree = curves[0].degree
+        nControlPoints = [len(curve.controlPoints) for curve in curves]
+        self.Pw = np.zeros((len(curves), max(nControlPoints), len(curves[0].controlPoints[0]) + 1))
+        for g, curve in enumerate(curves):
+            weights = getattr(curve, 'weights', np.ones(len(curve.controlPoints)))
+            self.Pw[g, :nControlPoints[g]] = gf.WeightedControlPoints(curve.controlPoints, weights, dimension=1)
+        self.knots = _PaddedKnots([curve.knotVector for curve in curves])
+        self.knotLengths = np.array([len(curve.knotVector) for curve in curves])
+
+    def Evaluate(self, members, parameters):
+        p = self.degree
+        spans = _Spans(p, self.knots, self.knotLengths, members, parameters)
+        B = _Basis(p, self.knots, spans, members, parameters)
+        P = self.Pw[members[:, None], spans[:, None] - p + np.arange(p + 1)]
+        Cw = np.einsum('ni,nid->nd', B, P)
+        return Cw[:, :-1] / Cw[:, -1:]
+
+class _SurfaceGroup:
+    # Padded storage for all surfaces in a collection that share a pair of degrees.
+    def __init__(self, surfaces, members):
+        self.members = np.asarray(members)
+        self.degree1, self.degree2 = surfaces[0].degree1, surfaces[0].degree2
+        shapes = [np.shape(surface.weights) for surface in surfaces]
+        self.Pw = np.zeros((len(surfaces), max(s[0] for s in shapes), max(s[1] for s in shapes), len(surfaces[0].controlPoints[0][0]) + 1))
+        for g, surface in enumerate(surfaces):
+            self.Pw[g, :shapes[g][0], :shapes[g][1]] = gf.WeightedControlPoints(surface.controlPoints, surface.weights, dimension=2)
+        self.knots1 = _PaddedKnots([surface.knotVector1 for surface in surfaces])
+        self.knots2 = _PaddedKnots([surface.knotVector2 for surface in surfaces])
+        self.knotLengths1 = np.array([len(surface.knotVector1) for surface in surfaces])
+        self.knotLengths2 = np.array([len(surface.knotVector2) for surface in surfaces])
+
+    def Evaluate(self, members, parameters):
+        p1, p2 = self.degree1, self.degree2
+        spans1 = _Spans(p1, self.knots1, self.knotLengths1, members, parameters[:, 0])
+        spans2 = _Spans(p2, self.knots2, self.knotLengths2, members, parameters[:, 1])
+        B1 = _Basis(p1, self.knots1, spans1, members, parameters[:, 0])
+        B2 = _Basis(p2, self.knots2, spans2, members, parameters[:, 1])
+        i1 = spans1[:, None] - p1 + np.arange(p1 + 1)
+        i2 = spans2[:, None] - p2 + np.arange(p2 + 1)
+        P = self.Pw[members[:, None, None], i1[:, :, None], i2[:, None, :]]
+        Sw = np.einsum('nk,nl,nkld->nd', B1, B2, P)
+        return Sw[:, :-1] / Sw[:, -1:]
+
+class _Collection:
+    # Shared grouping and evaluation logic for CurveCollection and SurfaceCollection.
+    def __init__(self, members, Key, Group):
+        self.members = list(members)
+        # all members share one array of results, so they must have the same number of coordinates
+        dimensions = sorted(set(np.shape(member.controlPoints)[-1] for member in self.members))
+        if len(dimensions) > 1:
+            raise ValueError("members have control points with {} coordinates, but a collection needs a single number of coordinates "
+                             "(e.g. give 2D members a zero z coordinate)".format(dimensions))
+        self.coordinateDimension = dimensions[0] if dimensions else 3
+        keys = {}
+        for i, member in enumerate(self.members):
+            keys.setdefault(Key(member), []).append(i)
+        self.groups = [Group([self.members[i] for i in indices], indices) for indices in keys.values()]
+        # map each member to its group and its row within that group
+        self.memberGroups = np.zeros(len(self.members), dtype=np.intp)
+        self.memberRows = np.zeros(len(self.members), dtype=np.intp)
+        for g, group in enumerate(self.groups):
+            self.memberGroups[group.members] = g
+            self.memberRows[group.members] = np.arange(len(group.members))
+
+    def __len__(self):
+        return len(self.members)
+
+    def _Evaluate(self, parameters, nParameters):
+        # Evaluates a list of parameter arrays (one per member), returning concatenated coordinates and offsets.
+        if len(parameters) != len(self.members):
+            raise ValueError("expected {} parameter arrays, one per member, not {}".format(len(self.members), len(parameters)))
+        parameters = [np.asarray(p, dtype=float).reshape((-1, nParameters) if nParameters > 1 else (-1,)) for p in parameters]
+        counts = np.array([len(p) for p in parameters], dtype=np.intp)
+        offsets = _Offsets(counts)
+        owners = np.repeat(np.arange(len(self.members)), counts)
+        allParameters = np.concatenate(parameters) if len(parameters) else np.zeros((0, nParameters))
+        points = np.zeros((len(owners), self.coordinateDimension))
+        for g, group in enumerate(self.groups):
+            rows = np.flatnonzero(self.memberGroups[owners] == g)
+            if len(rows) == 0:
+                continue
+            points[rows] = group.Evaluate(self.memberRows[owners[rows]], allParameters[rows])
+        return points, offsets
+
+class CurveCollection(_Collection):
+    """
+    Creates a collection of B-Spline and/or NURBS curves packed into padded arrays grouped by degree,
+    so that all curves can be evaluated together in one vectorised pass per degree.
+    All curves must have the same number of coordinates (2D and 3D curves cannot be mixed).
+    The collection copies control points, weights and knot vectors when it is created.
+
+    Arguments:
+    curves -- list of curve objects defined by classes from geom_classes.py
+    """
+    def __init__(self, curves):
+        _Collection.__init__(self, curves, lambda curve: curve.degree, _CurveGroup)
+
+    def Evaluate(self, parameters):
+        """
+        Returns an array of Cartesian coordinates for all members, and an array of offsets such that
+        member i's coordinates are rows offsets[i]:offsets[i+1].
+
+        Arguments:
+        parameters -- list containing one array of parametric coordinates for each member
+        """
+        return self._Evaluate(parameters, 1)
+
+    def CurveCoordinates(self, N=100):
+        """
+        Returns coordinates of N equally spaced parametric points along each member, and offsets as in Evaluate.
+        This is the collection equivalent of gf.CurveCoordinates.
+
+        Keyword arguments:
+        N -- number of points evaluated along each curve (default = 100)
+        """
+        parameters = [np.linspace(curve.knotVector[curve.degree], curve.knotVector[-(curve.degree + 1)], N) for curve in self.members]
+        return self.Evaluate(parameters)
+
+class SurfaceCollection(_Collection):
+    """
+    Creates a collection of NURBS surfaces packed into padded arrays grouped by degree,
+    so that all surfaces can be evaluated together in one vectorised pass per pair of degrees.
+    All surfaces must have the same number of coordinates.
+    The collection copies control points, weights and knot vectors when it is created.
+
+    Arguments:
+    surfaces -- list of surface objects defined by NURBS.Surface in geom_classes.py
+    """
+    def __init__(self, surfaces):
+        _Collection.__init__(self, surfaces, lambda surface: (surface.degree1, surface.degree2), _SurfaceGroup)
+
+    def Evaluate(self, parameters):
+        """
+        Returns an array of Cartesian coordinates for all members, and an array of offsets such that
+        member i's coordinates are rows offsets[i]:offsets[i+1].
+
+        Arguments:
+        parameters -- list containing one array of parametric coordinates with shape (number of points, 2) for each member
+        """
+        return self._Evaluate(parameters, 2)
+
+    def SurfaceCoordinates(self, N1=50, N2=50):
+        """
+        Returns coordinates of an N1 by N2 grid of parametric points on each member, and offsets as in Evaluate.
+        Each member's rows are ordered like a flattened NURBS.Surface.SurfaceCoordinates grid, with shape (N2, N1).
+
+        Keyword arguments:
+        N1, N2 -- number of points evaluated in directions 1 and 2 respectively (default = 50)
+        """
+        parameters = []
+        for surface in self.members:
+            parameter1values = np.linspace(surface.knotVector1[surface.degree1], surface.knotVector1[-(surface.degree1 + 1)], N1)
+            parameter2values = np.linspace(surface.knotVector2[surface.degree2], surface.knotVector2[-(surface.degree2 + 1)], N2)
+            parameter1mesh, parameter2mesh = np.meshgrid(parameter1values, parameter2values)
+            parameters.append(np.column_stack([parameter1mesh.ravel(), parameter2mesh.ravel()]))
+        return self.Evaluate(parameters)
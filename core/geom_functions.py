@@ -91,6 +91,16 @@ def WeightedControlPoints(controlPoints, weights, dimension):
                        Pw[i][j][k][l] = weights[i][j][k] * np.array(controlPoints[i][j][k][l]) 
     return Pw
 
+def VolumeDirectionOrder(controlNet):
+    """
+    Returns a volume's control point (or weighted control point) array with its axes in direction 1, 2, 3 order.
+    NURBS.Volume stores control points in (direction 1, direction 3, direction 2) order.
+
+    Arguments:
+    controlNet -- array of volume control points or weighted control points, as stored on NURBS.Volume
+    """
+    return np.swapaxes(np.asarray(controlNet), 1, 2)
+
 def BSplineBasisFuns(i, parameter, degree, knotVector):
     """
     Returns list of all non-zero B-Spline basis functions.
@@ -118,6 +128,101 @@ def BSplineBasisFuns(i, parameter, degree, knotVector):
         B[j] = saved
     return B
 
+def FindSpans(degree, parameters, knotVector):
+    """
+    Returns an array of knot span indices, one for each parameter in an array of parameters.
+    This is a vectorised version of FindSpan, using a sorted search in place of the binary search loop.
+
+    Arguments:
+    degree -- degree of polynomial segments
+    parameters -- array of parametric coordinates
+    knotVector -- list of parametric coords that define knot locations
+    """
+    knotVector = np.asarray(knotVector, dtype=float)
+    parameters = np.asarray(parameters, dtype=float)
+    # the curve is only defined between knotVector[degree] and knotVector[-degree-1], which differ from the ends of unclamped knot vectors
+    if np.any(parameters < knotVector[degree]) or np.any(parameters > knotVector[-degree-1]):
+        raise IndexError("parameters out of range: [{}, {}]".format(knotVector[degree], knotVector[-degree-1]))
+    n = len(knotVector) - degree - 2
+    spans = np.searchsorted(knotVector, parameters, side='right') - 1
+    return np.clip(spans, degree, n)
+
+def BSplineBasisFunsArray(spans, parameters, degree, knotVector):
+    """
+    Returns array of all non-zero B-Spline basis functions, with one row for each parameter.
+    This is a vectorised version of BSplineBasisFuns, where each step of the recursion is applied to every parameter at once.
+
+    Arguments:
+    spans -- array of knot span indices (see FindSpans)
+    parameters -- array of parametric coordinates
+    degree -- degree of polynomial segments
+    knotVector -- list of parametric coords that define knot locations
+    """
+    knotVector = np.asarray(knotVector, dtype=float)
+    parameters = np.asarray(parameters, dtype=float)
+    spans = np.asarray(spans, dtype=np.intp)
+    B = np.zeros(parameters.shape + (degree + 1,))
+    B[..., 0] = 1.0
+    left = np.zeros_like(B)
+    right = np.zeros_like(B)
+    for j in range(1, degree + 1):
+        left[..., j] = parameters - knotVector[spans+1-j]
+        right[..., j] = knotVector[spans+j] - parameters
+        saved = 0.0
+        for r in range(j):
+            temp = B[..., r] / (right[..., r+1] + left[..., j-r])
+            B[..., r] = saved + right[..., r+1] * temp
+            saved = left[..., j-r] * temp
+        B[..., j] = saved
+    return B
+
+def BSplineBasisFunDerivsArray(spans, parameters, degree, knotVector):
+    """
+    Returns array of first derivatives of all non-zero B-Spline basis functions, with one row for each parameter.
+    This is Eqn 2.7 on pg 59 of 'The NURBS Book' - Les Piegl & Wayne Tiller, 1997, applied to every parameter at once.
+
+    Arguments:
+    spans -- array of knot span indices (see FindSpans)
+    parameters -- array of parametric coordinates
+    degree -- degree of polynomial segments
+    knotVector -- list of parametric coords that define knot locations
+    """
+    knotVector = np.asarray(knotVector, dtype=float)
+    spans = np.asarray(spans, dtype=np.intp)
+    lower = BSplineBasisFunsArray(spans, parameters, degree - 1, knotVector)
+    dB = np.zeros(lower.shape[:-1] + (degree + 1,))
+    for r in range(degree + 1):
+        if r > 0:
+            denominator = knotVector[spans+r] - knotVector[spans-degree+r]
+            dB[..., r] += np.divide(lower[..., r-1], denominator, out=np.zeros_like(denominator), where=denominator != 0)
+        if r < degree:
+            denominator = knotVector[spans+r+1] - knotVector[spans-degree+r+1]
+            dB[..., r] -= np.divide(lower[..., r], denominator, out=np.zeros_like(denominator), where=denominator != 0)
+    return degree * dB
+
+def CurveDerivativesArray(curve, parameters):
+    """
+    Returns arrays of Cartesian coordinates and first derivatives at an array of parametric points on a curve.
+    B-Spline curves are treated as NURBS curves with unit weights, and the NURBS derivative is Eqn 4.8 on pg 125 of 'The NURBS Book' - Les Piegl & Wayne Tiller, 1997.
+
+    Arguments:
+    curve -- a curve object defined by a class from geom_classes.py
+    parameters -- array of parametric coordinates
+    """
+    parameters = np.asarray(parameters, dtype=float)
+    controlPoints = np.asarray(curve.controlPoints, dtype=float)
+    weights = np.asarray(getattr(curve, 'weights', np.ones(len(controlPoints))), dtype=float)
+    Pw = np.column_stack([controlPoints * weights[:, None], weights])
+    spans = FindSpans(curve.degree, parameters, curve.knotVector)
+    B = BSplineBasisFunsArray(spans, parameters, curve.degree, curve.knotVector)
+    dB = BSplineBasisFunDerivsArray(spans, parameters, curve.degree, curve.knotVector)
+    P = Pw[spans[..., None] - curve.degree + np.arange(curve.degree + 1)]
+    Cw = np.einsum('...i,...id->...d', B, P)
+    dCw = np.einsum('...i,...id->...d', dB, P)
+    C = Cw[..., :-1] / Cw[..., -1:]
+    dC = (dCw[..., :-1] - dCw[..., -1:] * C) / Cw[..., -1:]
+    return C, dC
+
 def ExtractCoordinates(listOfCoords):
     """
     Takes a list of coordinates and returns separate lists organised into x, y and z components respectively.
@@ -142,11 +247,28 @@ def CurveCoordinates(curve, N=100, **kwargs):
     start -- parametric coordinate at which curve begins (default value shown below)
     stop -- parametric coordinate at which curve stops (default value shown below)
     N -- number of points evaluated between start and stop (default = 100)
+    spacing -- either 'parameter' for points equally spaced in parametric coordinate, or 'arcLength' for points equally spaced along the curve (default = 'parameter')
+    table -- ArcLengthTable of the curve to reuse when spacing == 'arcLength' (default = a new table built for this call)
     """
     start = kwargs.get('start', curve.knotVector[curve.degree])
     stop = kwargs.get('stop', curve.knotVector[-(curve.degree + 1)])
-    parameterValues = np.linspace(start, stop, N)
-    return [curve.PointCoordinates(x) for x in parameterValues]
+    spacing = kwargs.get('spacing', 'parameter')
+    if spacing == 'parameter':
+        parameterValues = np.linspace(start, stop, N)
+    elif spacing == 'arcLength':
+        from .arc_length import ArcLengthTable
+        table = kwargs.get('table')
+        if table is None:
+            table = ArcLengthTable(curve)
+        elif table.curve is not curve:
+            raise ValueError("table was built for a different curve")
+        parameterValues = table.Parameters(np.linspace(table.Length(stop=start), table.Length(stop=stop), N))
+    else:
+        raise ValueError("spacing == {} not one of ['parameter', 'arcLength']".format(spacing))
+    from .backends import GetBackend
+    weights = getattr(curve, 'weights', np.ones(len(curve.controlPoints)))
+    Pw = WeightedControlPoints(curve.controlPoints, weights, dimension=1)
+    return list(GetBackend().CurvePoints(Pw, curve.degree, curve.knotVector, parameterValues))
     
 def KnotCoordinates(geometricObject):
     # Returns a list Cartesian knot coordinates of a given geometric object.
@@ -1,8 +1,12 @@
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
-import geom_functions as gf
-import geom_classes as gc
+from . import geom_functions as gf
+
+def _Pyplot():
+    # Returns matplotlib.pyplot, importing it (and registering the 3D projection) on first use.
+    # Importing matplotlib is slow, so it is deferred until a plot is actually made.
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
+    return plt
 
 def CurvePlot(curve, showControlPoints=True, showKnots=True, showControlPolygon=True, plotDimension='3D', N=100, **kwargs):
     """
@@ -16,6 +20,8 @@ def CurvePlot(curve, showControlPoints=True, showKnots=True, showControlPolygon=
     dimension -- dimension of plot (either '2D' or '3D', default = '3D')
     N -- number of points evaluated along curve (deafult = 100)
     """
+    plt = _Pyplot()
+    
     # evaluate points along curve
     start = kwargs.get('start', curve.knotVector[curve.degree])
     stop = kwargs.get('stop', curve.knotVector[-(curve.degree + 1)])
@@ -84,6 +90,8 @@ def SurfacePlot(surface, showControlPoints=True, showKnots=True, showControlPoly
     N1 -- number of points evaluated along surface in direction 1 (deafult = 50)
     N2 -- number of points evaluated along surface in direction 2 (deafult = 50)
     """
+    plt = _Pyplot()
+    
     # plotting surface as wireframe
     start1 = kwargs.get('start1', surface.knotVector1[surface.degree1])
     stop1 = kwargs.get('stop1', surface.knotVector1[-(surface.degree1 + 1)])
@@ -1,10 +1,6 @@
-import sys
-import os
-parentPath = os.path.dirname(os.getcwd()) + '/core'
-sys.path.insert(0, parentPath)
-import geom_classes as gc
-import geom_functions as gf
-import visualisation as visual
+from freeformdeformation import geom_classes as gc
+from freeformdeformation import geom_functions as gf
+from freeformdeformation import visualisation as visual
 from math import sqrt
 
 # Bezier surface example - https://gist.github.com/orbingol/05f0f6930331b7c3007644c31ae6e4bc
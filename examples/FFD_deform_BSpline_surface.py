@@ -1,10 +1,6 @@
-import sys
-import os
-parentPath = os.path.dirname(os.getcwd()) + '/core'
-sys.path.insert(0, parentPath)
-import geom_classes as gc
-import geom_functions as gf
-import visualisation as visual
+from freeformdeformation import geom_classes as gc
+from freeformdeformation import geom_functions as gf
+from freeformdeformation import visualisation as visual
 from math import sqrt
 
 # Free-form deformation example - deforming a NURBS surface within a NURBS volume
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+import freeformdeformation as ffd
+
+def Curve():
+    # Returns the rational curve from examples/NURBS_curve_2D.py.
+    curve = ffd.NURBS.Curve()
+    curve.controlPoints = [[1, 0, 0], [1, 2, 0], [2, 1, 0], [3, 3, 0]]
+    curve.weights = [1, 3, 1, 8]
+    curve.degree = 2
+    curve.knotVector = ffd.KnotVector(len(curve.controlPoints), curve.degree)
+    return curve
+
+def test_length_matches_dense_polyline():
+    curve = Curve()
+    points = np.array(ffd.CurveCoordinates(curve, N=20001))
+    assert ffd.ArcLengthTable(curve).TotalLength() == pytest.approx(np.linalg.norm(np.diff(points, axis=0), axis=1).sum(), rel=1e-8)
+
+def test_parameters_invert_length():
+    table = ffd.ArcLengthTable(Curve())
+    arcLengths = np.linspace(0, table.TotalLength(), 13)
+    np.testing.assert_allclose(table.Length(stop=table.Parameters(arcLengths)), arcLengths, atol=1e-10)
+
+def test_curve_coordinates_reuse_table():
+    curve = Curve()
+    table = ffd.ArcLengthTable(curve)
+    points = ffd.CurveCoordinates(curve, N=9, spacing='arcLength', table=table)
+    np.testing.assert_allclose(points, ffd.CurveCoordinates(curve, N=9, spacing='arcLength'))
+    with pytest.raises(ValueError):
+        ffd.CurveCoordinates(Curve(), N=9, spacing='arcLength', table=table)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from freeformdeformation import backends
+
+def KnotVector(nControlPoints, degree, rng, clamped=True):
+    # Returns a random knot vector on [0, 1], clamped or with unclamped (spread out) end knots.
+    interior = np.sort(rng.uniform(0, 1, nControlPoints - degree - 1))
+    if clamped:
+        return np.concatenate([np.zeros(degree + 1), interior, np.ones(degree + 1)])
+    return np.concatenate([-np.arange(degree + 1, 0, -1) / 10, interior, 1 + np.arange(1, degree + 2) / 10])
+
+def Problems(clamped):
+    # Returns kernel name -> arguments for random rational curve, surface and volume problems, including both ends of the range.
+    rng = np.random.default_rng(0)
+    def Direction(nControlPoints, degree):
+        knotVector = KnotVector(nControlPoints, degree, rng, clamped)
+        start, stop = knotVector[degree], knotVector[-degree-1]
+        parameters = np.concatenate([[start, stop], rng.uniform(start, stop, 200)])
+        return degree, knotVector, parameters
+    def ControlNet(shape):
+        weights = rng.uniform(0.5, 2.0, shape)
+        return np.concatenate([rng.normal(size=shape + (3,)) * weights[..., None], weights[..., None]], axis=-1)
+    (p1, k1, u1), (p2, k2, u2), (p3, k3, u3) = Direction(8, 3), Direction(6, 2), Direction(7, 4)
+    return {
+        'CurvePoints': (ControlNet((8,)), p1, k1, u1),
+        'SurfacePoints': (ControlNet((8, 6)), p1, p2, k1, k2, u1, u2),
+        'VolumePoints': (ControlNet((8, 6, 7)), p1, p2, p3, k1, k2, k3, u1, u2, u3),
+    }
+
+def LoadOrSkip(name):
+    if name == 'numba':
+        pytest.importorskip('numba')
+    return backends.LoadBackend(name)
+
+@pytest.mark.parametrize('name', ['loop', 'numba'])
+@pytest.mark.parametrize('clamped', [True, False])
+@pytest.mark.parametrize('kernel', ['CurvePoints', 'SurfacePoints', 'VolumePoints'])
+def test_backend_matches_numpy_reference(name, clamped, kernel):
+    backend = LoadOrSkip(name)
+    arguments = Problems(clamped)[kernel]
+    expected = getattr(backends.LoadBackend('numpy'), kernel)(*arguments)
+    np.testing.assert_allclose(getattr(backend, kernel)(*arguments), expected, rtol=0, atol=1e-12)
+
+@pytest.mark.parametrize('name', ['numpy', 'loop', 'numba'])
+def test_parameters_outside_unclamped_domain_raise(name):
+    backend = LoadOrSkip(name)
+    Pw, degree, knotVector, _ = Problems(clamped=False)['CurvePoints']
+    # between the first knot and knotVector[degree], which used to hang the loop kernels
+    with pytest.raises(IndexError):
+        backend.CurvePoints(Pw, degree, knotVector, np.array([(knotVector[0] + knotVector[degree]) / 2]))
+
+def test_set_backend_falls_back_to_numpy_with_warning(monkeypatch):
+    def Missing():
+        raise ImportError("No module named 'numba'")
+    monkeypatch.setitem(backends.BACKENDS, 'numba', Missing)
+    monkeypatch.setattr(backends, '_loaded', {})
+    monkeypatch.setattr(backends, '_active', 'numpy')
+    with pytest.warns(UserWarning, match="falling back to 'numpy'"):
+        assert backends.SetBackend('numba') == 'numpy'
+    assert backends.GetBackend().name == 'numpy'
+    with pytest.raises(ImportError):
+        backends.SetBackend('numba', fallback=False)
+
+def test_set_backend_rejects_unknown_name():
+    with pytest.raises(ValueError):
+        backends.SetBackend('fortran')
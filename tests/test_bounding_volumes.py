@@ -0,0 +1,131 @@
+import numpy as np
+import freeformdeformation as ffd
+
+def FlatPatch():
+    # Returns a flat bilinear patch in the plane z == 0 with 3 by 2 elements.
+    surface = ffd.NURBS.Surface()
+    surface.controlPoints = [[[x, y, 0.0] for y in range(3)] for x in range(4)]
+    surface.weights = [[1.0] * 3 for _ in range(4)]
+    surface.degree1, surface.degree2 = 1, 1
+    surface.knotVector1 = ffd.KnotVector(4, 1)
+    surface.knotVector2 = ffd.KnotVector(3, 1)
+    return surface
+
+def test_ray_candidates_include_face_grazing_rays():
+    bvh = ffd.BoundingVolumeHierarchy(FlatPatch(), leafSize=1)
+    # x-directed rays lying in the plane of the patch, on the y faces shared by elements and through their middles
+    origins = np.array([[-1.0, 0.0, 0.0], [-1.0, 1.0, 0.0], [-1.0, 0.5, 0.0], [-1.0, 2.0, 0.0], [-1.0, 0.5, 1e-9]])
+    directions = np.tile([1.0, 0.0, 0.0], (len(origins), 1))
+    rays, elements = bvh.RayCandidates(origins, directions)
+    hits = [set(elements[rays == r]) for r in range(len(origins))]
+    lowerY, upperY = bvh.elementLower[:, 1], bvh.elementUpper[:, 1]
+    for r, y in enumerate(origins[:4, 1]):
+        assert hits[r] == set(np.flatnonzero((lowerY <= y) & (y <= upperY)))
+    assert hits[4] == set()
+
+def test_empty_batches():
+    bvh = ffd.BoundingVolumeHierarchy(FlatPatch())
+    empty = np.zeros((0, 3))
+    for queries, elements in (bvh.CandidateElements(empty), bvh.RayCandidates(empty, empty)):
+        assert len(queries) == 0 and len(elements) == 0
+    assert bvh.PointsInBounds(empty).shape == (0,)
+
+def WavySurface():
+    # Returns a rational surface with repeated interior knots in both directions.
+    rng = np.random.default_rng(3)
+    surface = ffd.NURBS.Surface()
+    x, y = np.meshgrid(np.arange(9.0), np.arange(7.0), indexing='ij')
+    surface.controlPoints = np.stack([x, y, rng.normal(scale=0.5, size=x.shape)], axis=-1).tolist()
+    surface.weights = rng.uniform(0.5, 2.0, x.shape).tolist()
+    surface.degree1, surface.degree2 = 3, 2
+    surface.knotVector1 = [0, 0, 0, 0, 1, 2, 2, 3, 4, 5, 5, 5, 5]
+    surface.knotVector2 = [0, 0, 0, 1, 1, 2, 3, 4, 4, 4]
+    return surface
+
+def BruteForceBoxes(surface):
+    # Returns element spans and boxes computed one element at a time from the control net.
+    controlPoints = np.asarray(surface.controlPoints)
+    spans, lower, upper = [], [], []
+    for s1 in range(surface.degree1, len(surface.knotVector1) - surface.degree1 - 1):
+        for s2 in range(surface.degree2, len(surface.knotVector2) - surface.degree2 - 1):
+            if surface.knotVector1[s1] < surface.knotVector1[s1+1] and surface.knotVector2[s2] < surface.knotVector2[s2+1]:
+                net = controlPoints[s1-surface.degree1:s1+1, s2-surface.degree2:s2+1].reshape(-1, 3)
+                spans.append([s1, s2])
+                lower.append(net.min(axis=0))
+                upper.append(net.max(axis=0))
+    return np.array(spans), np.array(lower), np.array(upper)
+
+def Pairs(queries, elements):
+    return sorted(zip(queries.tolist(), elements.tolist()))
+
+def test_element_boxes_match_brute_force():
+    surface = WavySurface()
+    bvh = ffd.BoundingVolumeHierarchy(surface, leafSize=2)
+    spans, lower, upper = BruteForceBoxes(surface)
+    np.testing.assert_array_equal(bvh.spans, spans)
+    np.testing.assert_array_equal(bvh.elementLower, lower)
+    np.testing.assert_array_equal(bvh.elementUpper, upper)
+
+def test_elements_contain_surface_points():
+    surface = WavySurface()
+    bvh = ffd.BoundingVolumeHierarchy(surface, leafSize=2)
+    X, Y, Z = surface.SurfaceCoordinates(N1=40, N2=30)
+    assert bvh.PointsInBounds(np.column_stack([X.ravel(), Y.ravel(), Z.ravel()]), tolerance=1e-12).all()
+
+def test_point_queries_match_brute_force():
+    bvh = ffd.BoundingVolumeHierarchy(WavySurface(), leafSize=2)
+    points = np.random.default_rng(4).uniform([-1, -1, -2], [9, 7, 2], (400, 3))
+    inside = np.all((points[:, None] >= bvh.elementLower) & (points[:, None] <= bvh.elementUpper), axis=-1)
+    assert Pairs(*bvh.CandidateElements(points)) == Pairs(*np.nonzero(inside))
+    np.testing.assert_array_equal(bvh.PointsInBounds(points), inside.any(axis=1))
+    distances = np.linalg.norm(np.maximum(np.maximum(bvh.elementLower - points[:, None], points[:, None] - bvh.elementUpper), 0), axis=-1)
+    elements, nearest = bvh.NearestElements(points)
+    np.testing.assert_allclose(nearest, distances.min(axis=1))
+    np.testing.assert_allclose(distances[np.arange(len(points)), elements], nearest)
+
+def test_ray_candidates_match_brute_force():
+    bvh = ffd.BoundingVolumeHierarchy(WavySurface(), leafSize=2)
+    rng = np.random.default_rng(5)
+    origins = rng.uniform([-3, -3, -3], [11, 9, 3], (300, 3))
+    directions = rng.normal(size=(300, 3))
+    with np.errstate(divide='ignore'):
+        t1 = (bvh.elementLower - origins[:, None]) / directions[:, None]
+        t2 = (bvh.elementUpper - origins[:, None]) / directions[:, None]
+    tNear, tFar = np.minimum(t1, t2).max(axis=-1), np.maximum(t1, t2).min(axis=-1)
+    assert Pairs(*bvh.RayCandidates(origins, directions)) == Pairs(*np.nonzero(tFar >= np.maximum(tNear, 0)))
+
+def test_refit_matches_rebuilt_hierarchy():
+    surface = WavySurface()
+    bvh = ffd.BoundingVolumeHierarchy(surface, leafSize=2)
+    rng = np.random.default_rng(6)
+    surface.controlPoints = (np.asarray(surface.controlPoints) + rng.normal(scale=0.7, size=(9, 7, 3))).tolist()
+    bvh.Refit()
+    rebuilt = ffd.BoundingVolumeHierarchy(surface, leafSize=2)
+    np.testing.assert_array_equal(bvh.elementLower, rebuilt.elementLower)
+    np.testing.assert_array_equal(bvh.elementUpper, rebuilt.elementUpper)
+    np.testing.assert_array_equal(bvh.nodeLower[0], rebuilt.nodeLower[0])
+    np.testing.assert_array_equal(bvh.nodeUpper[0], rebuilt.nodeUpper[0])
+    points = rng.uniform([-2, -2, -3], [10, 8, 3], (300, 3))
+    assert Pairs(*bvh.CandidateElements(points)) == Pairs(*rebuilt.CandidateElements(points))
+    np.testing.assert_allclose(bvh.NearestElements(points)[1], rebuilt.NearestElements(points)[1])
+
+def test_volume_elements_contain_volume_points():
+    rng = np.random.default_rng(7)
+    volume = ffd.NURBS.Volume()
+    # control points are stored in (direction 1, direction 3, direction 2) order
+    grid = np.stack(np.meshgrid(np.arange(5.0), np.arange(3.0), np.arange(4.0), indexing='ij'), axis=-1)[..., [0, 2, 1]]
+    volume.controlPoints = (grid + rng.normal(scale=0.2, size=grid.shape)).tolist()
+    volume.weights = rng.uniform(0.5, 2.0, grid.shape[:-1]).tolist()
+    volume.degree1, volume.degree2, volume.degree3 = 2, 2, 1
+    volume.knotVector1 = [0, 0, 0, 1, 1, 2, 2, 2]
+    volume.knotVector2 = ffd.KnotVector(4, 2)
+    volume.knotVector3 = ffd.KnotVector(3, 1)
+    bvh = ffd.BoundingVolumeHierarchy(volume, leafSize=1)
+    assert bvh.spans.shape == (2 * 2 * 2, 3)
+    parameters = rng.uniform(0, 1, (500, 3)) * [2, 2, 2]
+    points = np.array([volume.PointCoordinates(*p) for p in parameters])
+    candidates, elements = bvh.CandidateElements(points, tolerance=1e-12)
+    # each point must be a candidate of the element whose knot spans contain its parameters
+    spans = np.column_stack([2 * np.floor(parameters[:, 0]) + 2, np.floor(parameters[:, 1]) + 2, np.floor(parameters[:, 2]) + 1])
+    found = set(zip(candidates.tolist(), map(tuple, bvh.spans[elements].tolist())))
+    assert all((i, tuple(int(s) for s in spans[i])) in found for i in range(len(points)))
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+import freeformdeformation as ffd
+
+def Volume():
+    # Returns a slightly distorted rational lattice over [0, 3] x [0, 2] x [0, 1].
+    rng = np.random.default_rng(0)
+    volume = ffd.NURBS.Volume()
+    # control points are stored in (direction 1, direction 3, direction 2) order
+    volume.controlPoints = (np.stack(np.meshgrid(np.arange(4.0), np.linspace(0, 1, 3), np.linspace(0, 2, 4), indexing='ij'), axis=-1)[..., [0, 2, 1]]
+                            + rng.normal(scale=0.05, size=(4, 3, 4, 3))).tolist()
+    volume.weights = rng.uniform(0.5, 2.0, (4, 3, 4)).tolist()
+    volume.degree1, volume.degree2, volume.degree3 = 2, 3, 2
+    volume.knotVector1 = ffd.KnotVector(4, 2)
+    volume.knotVector2 = ffd.KnotVector(4, 3)
+    volume.knotVector3 = ffd.KnotVector(3, 2)
+    return volume
+
+def Parameters(volume, n=50):
+    rng = np.random.default_rng(1)
+    return np.column_stack([rng.uniform(k[0], k[-1], n) for k in (volume.knotVector1, volume.knotVector2, volume.knotVector3)])
+
+def test_double_matches_point_coordinates():
+    volume = Volume()
+    parameters = Parameters(volume)
+    expected = [volume.PointCoordinates(*p) for p in parameters]
+    np.testing.assert_allclose(ffd.EmbeddedPoints(volume, parameters, blockSize=7).PointCoordinates(blockSize=5), expected, atol=1e-12)
+
+@pytest.mark.parametrize('precision', ['single', 'mixed'])
+def test_reduced_precision_tables(precision):
+    volume = Volume()
+    parameters = Parameters(volume)
+    embedded = ffd.EmbeddedPoints(volume, parameters, precision, blockSize=7)
+    assert all(B.dtype == np.float32 for B in embedded.basis)
+    assert all(spans.dtype == np.uint8 for spans in embedded.spans)
+    report = ffd.PrecisionReport(volume, parameters, precision)
+    assert report['maxError'] < 1e-5 and report['memoryRatio'] < 0.5
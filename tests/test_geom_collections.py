@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+import freeformdeformation as ffd
+
+def Curve(controlPoints, degree):
+    curve = ffd.NURBS.Curve()
+    curve.controlPoints = controlPoints
+    curve.weights = [1.0] * len(controlPoints)
+    curve.degree = degree
+    curve.knotVector = ffd.KnotVector(len(controlPoints), degree)
+    return curve
+
+def test_collection_matches_curve_coordinates():
+    curves = [Curve([[0, 0, 0], [1, 2, 0], [2, 1, 1], [3, 3, 0]], 2), Curve([[0, 0, 0], [1, 1, 1]], 1),
+              Curve([[1, 0, 0], [1, 2, 0], [2, 1, 0], [3, 3, 0], [4, 0, 2]], 2)]
+    points, offsets = ffd.CurveCollection(curves).CurveCoordinates(N=11)
+    for i, curve in enumerate(curves):
+        np.testing.assert_allclose(points[offsets[i]:offsets[i+1]], ffd.CurveCoordinates(curve, N=11), atol=1e-12)
+
+def test_empty_collection():
+    points, offsets = ffd.CurveCollection([]).Evaluate([])
+    assert points.shape[0] == 0 and list(offsets) == [0]
+
+def test_mixed_coordinate_dimensions_rejected():
+    with pytest.raises(ValueError, match='coordinates'):
+        ffd.CurveCollection([Curve([[0, 0], [1, 1]], 1), Curve([[0, 0, 0], [1, 1, 1]], 1)])
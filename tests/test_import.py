@@ -0,0 +1,9 @@
+import subprocess
+import sys
+
+def test_import_does_not_load_optional_dependencies():
+    # a fresh interpreter, like a short-lived worker, must not pay for plotting or compiled backends it never uses
+    snippet = ("import sys; import freeformdeformation; freeformdeformation.NURBS.Curve; "
+               "print(sorted(name for name in ('matplotlib', 'numba') if name in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', snippet], check=True, capture_output=True, text=True).stdout
+    assert output.strip() == '[]'